@@ -0,0 +1,318 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True, language_level=3
+"""
+Cython Port of the A* Search Loops
+
+This module is a C-compiled copy of astar_core and astar_bidirectional_core
+from pathfinding_numba.py for installs without Numba. It works on the same
+flat arrays, follows the same steps and tie-breaking, and returns the same
+paths, explored nodes and expansion counts, but is compiled once at build
+time instead of on first use.
+
+PathFinder uses it when Numba is not installed and the extension has been
+built with:
+    python setup.py build_ext --inplace
+
+Functions:
+    astar_core: A* Search over packed indices
+    astar_bidirectional_core: Bidirectional A* Search over packed indices
+"""
+
+import numpy as np
+
+# g-score of nodes the search has not reached yet
+cdef int UNREACHED = 2147483647
+
+
+cdef inline bint _heap_less(const long long* heap_f, const int* heap_id,
+                            Py_ssize_t a, Py_ssize_t b) noexcept nogil:
+    """Whether heap entry a orders before entry b by (f_score, packed index)."""
+    return heap_f[a] < heap_f[b] or (heap_f[a] == heap_f[b] and heap_id[a] < heap_id[b])
+
+
+cdef inline void _heap_swap(long long* heap_f, int* heap_id, Py_ssize_t a, Py_ssize_t b) noexcept nogil:
+    """Swap heap entries a and b."""
+    heap_f[a], heap_f[b] = heap_f[b], heap_f[a]
+    heap_id[a], heap_id[b] = heap_id[b], heap_id[a]
+
+
+cdef inline void _sift_up(long long* heap_f, int* heap_id, Py_ssize_t i) noexcept nogil:
+    """Move entry i up until its parent orders before it."""
+    cdef Py_ssize_t parent
+    while i > 0:
+        parent = (i - 1) >> 1
+        if not _heap_less(heap_f, heap_id, i, parent):
+            break
+        _heap_swap(heap_f, heap_id, i, parent)
+        i = parent
+
+
+cdef inline void _sift_down(long long* heap_f, int* heap_id, Py_ssize_t size) noexcept nogil:
+    """Move the root entry down until both its children order after it."""
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t left, child
+    while True:
+        left = 2 * i + 1
+        if left >= size:
+            break
+        child = left
+        if left + 1 < size and _heap_less(heap_f, heap_id, left + 1, left):
+            child = left + 1
+        if not _heap_less(heap_f, heap_id, child, i):
+            break
+        _heap_swap(heap_f, heap_id, i, child)
+        i = child
+
+
+cdef class _Heap:
+    """Array-backed binary heap of (f_score, packed index) entries."""
+
+    cdef object f_array, id_array
+    cdef long long[::1] f
+    cdef int[::1] ids
+    cdef Py_ssize_t size
+
+    def __cinit__(self):
+        self.f_array = np.empty(64, dtype=np.int64)
+        self.id_array = np.empty(64, dtype=np.int32)
+        self.f = self.f_array
+        self.ids = self.id_array
+        self.size = 0
+
+    cdef void push(self, long long f, int node):
+        """Push (f, node), growing the arrays when full."""
+        if self.size == self.f.shape[0]:
+            self.f_array = np.resize(self.f_array, 2 * self.size)
+            self.id_array = np.resize(self.id_array, 2 * self.size)
+            self.f = self.f_array
+            self.ids = self.id_array
+        self.f[self.size] = f
+        self.ids[self.size] = node
+        _sift_up(&self.f[0], &self.ids[0], self.size)
+        self.size += 1
+
+    cdef int pop(self, long long* f) noexcept:
+        """Remove the smallest entry of a non-empty heap, returning its packed index and f_score."""
+        cdef int node = self.ids[0]
+        f[0] = self.f[0]
+        self.size -= 1
+        self.f[0] = self.f[self.size]
+        self.ids[0] = self.ids[self.size]
+        _sift_down(&self.f[0], &self.ids[0], self.size)
+        return node
+
+
+cdef _trace_path(const int[::1] came_from, int node):
+    """
+    Follow predecessors back from node to the search start.
+
+    Returns:
+        np.ndarray: int32 packed indices from the start to node
+    """
+    cdef Py_ssize_t length = 1
+    cdef Py_ssize_t i
+    cdef int current = node
+    while came_from[current] != -1:
+        current = came_from[current]
+        length += 1
+    path = np.empty(length, dtype=np.int32)
+    cdef int[::1] path_view = path
+    current = node
+    for i in range(length - 1, -1, -1):
+        path_view[i] = current
+        current = came_from[current]
+    return path
+
+
+def astar_core(const int[::1] indptr, const int[::1] indices, const int[::1] heuristic,
+               int start, int goal):
+    """
+    Perform A* Search on packed indices.
+
+    Args:
+        indptr (np.ndarray): CSR offsets of the grid's neighbor table
+        indices (np.ndarray): CSR neighbor indices of the grid's neighbor table
+        heuristic (np.ndarray): int32 heuristic cost of every packed index
+        start (int): Packed index of the start
+        goal (int): Packed index of the goal
+
+    Returns:
+        Tuple containing:
+        - np.ndarray: int32 packed indices of the path (empty if no path exists)
+        - np.ndarray: int32 packed indices of explored nodes, in expansion order
+        - int: Number of nodes expanded
+    """
+    cdef Py_ssize_t n_cells = indptr.shape[0] - 1
+
+    came_from_array = np.full(n_cells, -1, dtype=np.int32)
+    g_score_array = np.full(n_cells, UNREACHED, dtype=np.int32)
+    closed_array = np.zeros(n_cells, dtype=np.uint8)
+    explored_array = np.empty(n_cells, dtype=np.int32)
+    cdef int[::1] came_from = came_from_array
+    cdef int[::1] g_score = g_score_array
+    cdef unsigned char[::1] closed = closed_array
+    cdef int[::1] explored = explored_array
+    cdef Py_ssize_t n_explored = 0
+    cdef long long nodes_expanded = 0
+
+    cdef _Heap frontier = _Heap()
+    frontier.push(0, start)
+    g_score[start] = 0
+
+    cdef long long f
+    cdef int current, next_pos, new_cost
+    cdef Py_ssize_t k
+
+    while frontier.size > 0:
+        current = frontier.pop(&f)
+        # Skip entries left behind when the node was pushed again with a
+        # lower g_score
+        if f > g_score[current] + heuristic[current]:
+            continue
+
+        if current == goal:
+            return _trace_path(came_from, goal), explored_array[:n_explored].copy(), nodes_expanded
+
+        closed[current] = 1
+        explored[n_explored] = current
+        n_explored += 1
+        nodes_expanded += 1
+
+        new_cost = g_score[current] + 1
+        for k in range(indptr[current], indptr[current + 1]):
+            next_pos = indices[k]
+            # Expanded nodes are never reopened, as in PathFinder.astar_search
+            if closed[next_pos]:
+                continue
+            if new_cost < g_score[next_pos]:
+                g_score[next_pos] = new_cost
+                # f_score = g_score + heuristic
+                frontier.push(new_cost + heuristic[next_pos], next_pos)
+                came_from[next_pos] = current
+        # Stop as soon as the goal is reached, as in PathFinder.astar_search
+        if came_from[goal] == current:
+            return _trace_path(came_from, goal), explored_array[:n_explored].copy(), nodes_expanded
+
+    return np.empty(0, dtype=np.int32), explored_array[:n_explored].copy(), nodes_expanded
+
+
+cdef int _expand_side(const int[::1] indptr, const int[::1] indices, const int[::1] heuristic,
+                      _Heap frontier, int[::1] g_score, int[::1] came_from, const int[::1] g_other,
+                      unsigned char[::1] closed, unsigned char[::1] seen, int[::1] explored,
+                      Py_ssize_t* n_explored, long long* best_cost, int* meet) except -1:
+    """
+    Expand the best frontier node of one side of a bidirectional search.
+
+    Every node this side reaches that the other side has reached too closes
+    a start-goal path through it; the cheapest such path is kept in
+    best_cost and meet. A popped entry whose g_score is out of date is
+    dropped without expanding anything. As in astar_core, nodes this side
+    has expanded are never reopened; closed holds this side's flags, while
+    seen marks the nodes already written to explored by either side.
+
+    Returns:
+        int: 1 if a node was expanded, 0 if the popped entry was dropped
+    """
+    cdef long long f
+    cdef int current = frontier.pop(&f)
+    cdef int next_pos, new_cost
+    cdef Py_ssize_t k
+    if f > g_score[current] + heuristic[current]:
+        return 0
+    closed[current] = 1
+    if not seen[current]:
+        seen[current] = 1
+        explored[n_explored[0]] = current
+        n_explored[0] += 1
+    if g_other[current] != UNREACHED and g_score[current] + g_other[current] < best_cost[0]:
+        best_cost[0] = g_score[current] + g_other[current]
+        meet[0] = current
+
+    new_cost = g_score[current] + 1
+    for k in range(indptr[current], indptr[current + 1]):
+        next_pos = indices[k]
+        if closed[next_pos]:
+            continue
+        if new_cost < g_score[next_pos]:
+            g_score[next_pos] = new_cost
+            frontier.push(new_cost + heuristic[next_pos], next_pos)
+            came_from[next_pos] = current
+            if g_other[next_pos] != UNREACHED and new_cost + g_other[next_pos] < best_cost[0]:
+                best_cost[0] = new_cost + g_other[next_pos]
+                meet[0] = next_pos
+    return 1
+
+
+def astar_bidirectional_core(const int[::1] indptr, const int[::1] indices,
+                             const int[::1] goal_heuristic, const int[::1] start_heuristic,
+                             int start, int goal):
+    """
+    Perform bidirectional A* Search on packed indices.
+
+    Args:
+        indptr (np.ndarray): CSR offsets of the grid's neighbor table
+        indices (np.ndarray): CSR neighbor indices of the grid's neighbor table
+        goal_heuristic (np.ndarray): int32 heuristic cost to the goal of every packed index
+        start_heuristic (np.ndarray): int32 heuristic cost to the start of every packed index
+        start (int): Packed index of the start
+        goal (int): Packed index of the goal
+
+    Returns:
+        Tuple containing:
+        - np.ndarray: int32 packed indices of the path (empty if no path exists)
+        - np.ndarray: int32 packed indices of explored nodes, in expansion order
+        - int: Number of nodes expanded
+    """
+    cdef Py_ssize_t n_cells = indptr.shape[0] - 1
+
+    g_forward_array = np.full(n_cells, UNREACHED, dtype=np.int32)
+    g_backward_array = np.full(n_cells, UNREACHED, dtype=np.int32)
+    came_from_forward_array = np.full(n_cells, -1, dtype=np.int32)
+    came_from_backward_array = np.full(n_cells, -1, dtype=np.int32)
+    closed_forward_array = np.zeros(n_cells, dtype=np.uint8)
+    closed_backward_array = np.zeros(n_cells, dtype=np.uint8)
+    seen_array = np.zeros(n_cells, dtype=np.uint8)
+    explored_array = np.empty(n_cells, dtype=np.int32)
+    cdef int[::1] g_forward = g_forward_array
+    cdef int[::1] g_backward = g_backward_array
+    cdef int[::1] came_from_forward = came_from_forward_array
+    cdef int[::1] came_from_backward = came_from_backward_array
+    cdef unsigned char[::1] closed_forward = closed_forward_array
+    cdef unsigned char[::1] closed_backward = closed_backward_array
+    cdef unsigned char[::1] seen = seen_array
+    cdef int[::1] explored = explored_array
+    cdef Py_ssize_t n_explored = 0
+    cdef long long nodes_expanded = 0
+
+    cdef _Heap forward_frontier = _Heap()
+    cdef _Heap backward_frontier = _Heap()
+    forward_frontier.push(0, start)
+    backward_frontier.push(0, goal)
+    g_forward[start] = 0
+    g_backward[goal] = 0
+
+    cdef long long best_cost = UNREACHED
+    cdef int meet = -1
+    cdef bint forward = True
+    cdef int expanded
+    while forward_frontier.size > 0 and backward_frontier.size > 0:
+        # No path through either frontier can beat the best meeting found
+        if max(forward_frontier.f[0], backward_frontier.f[0]) >= best_cost:
+            break
+        if forward:
+            expanded = _expand_side(indptr, indices, goal_heuristic, forward_frontier, g_forward,
+                                    came_from_forward, g_backward, closed_forward, seen, explored,
+                                    &n_explored, &best_cost, &meet)
+        else:
+            expanded = _expand_side(indptr, indices, start_heuristic, backward_frontier, g_backward,
+                                    came_from_backward, g_forward, closed_backward, seen, explored,
+                                    &n_explored, &best_cost, &meet)
+        if expanded:
+            nodes_expanded += 1
+            forward = not forward
+
+    if meet == -1:
+        return np.empty(0, dtype=np.int32), explored_array[:n_explored].copy(), nodes_expanded
+    # start -> meet, then meet -> goal along the backward predecessors
+    head = _trace_path(came_from_forward, meet)
+    tail = _trace_path(came_from_backward, meet)[::-1]
+    return np.concatenate((head, tail[1:])), explored_array[:n_explored].copy(), nodes_expanded
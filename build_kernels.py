@@ -0,0 +1,60 @@
+"""
+Ahead-of-Time Compilation of the Grid Kernels
+
+This script compiles the hot kernels from grid_kernels.py and the search
+loops from pathfinding_numba.py into a native extension module,
+grid_kernels_aot, placed next to this file. When that module is present
+both use it instead of JIT-compiling, so the first search after start-up
+does not wait for Numba's compiler, and the compiled code also works on
+installs without Numba.
+
+The build uses numba.pycc, which Numba has deprecated and plans to remove;
+it needs a Numba release that still ships it. Without one, the Cython
+extension built by setup.py covers the search loops instead.
+
+Usage:
+    python build_kernels.py
+"""
+
+import os
+import sys
+
+# Compile from the Numba kernels even if an older AOT build is present
+sys.modules['grid_kernels_aot'] = None
+
+try:
+    from numba.pycc import CC
+except ImportError:
+    sys.exit("build_kernels.py needs numba.pycc, which this Numba release does not ship; "
+             "use an older Numba or build the Cython extension: python setup.py build_ext --inplace")
+import grid_kernels
+import pathfinding_numba
+
+# Exported kernels and their signatures
+EXPORTS = {
+    'build_neighbor_table': 'UniTuple(i4[::1], 2)(u1[:, ::1])',
+    'expand_node': 'i8(i4[::1], i4[::1], i8, i4[::1], i4[::1], i4[::1])',
+    '_manhattan': 'i8(i8, i8, i8, i8)',
+    '_euclid': 'f4(i8, i8, i8, i8)',
+}
+
+# Exported search loops from pathfinding_numba and their signatures
+SEARCH_EXPORTS = {
+    'astar_core': 'Tuple((i4[::1], i4[::1], i8))(i4[::1], i4[::1], i4[::1], i8, i8)',
+    'astar_bidirectional_core':
+        'Tuple((i4[::1], i4[::1], i8))(i4[::1], i4[::1], i4[::1], i4[::1], i8, i8)',
+}
+
+
+def build():
+    """Compile the exported kernels and search loops into grid_kernels_aot."""
+    cc = CC('grid_kernels_aot')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    for module, exports in ((grid_kernels, EXPORTS), (pathfinding_numba, SEARCH_EXPORTS)):
+        for name, signature in exports.items():
+            cc.export(name, signature)(getattr(module, name).py_func)
+    cc.compile()
+
+
+if __name__ == "__main__":
+    build()
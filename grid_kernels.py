@@ -0,0 +1,199 @@
+"""
+Compiled Kernels for the Grid World
+
+This module holds the innermost per-node operations used by the pathfinding
+algorithms: neighbor generation and distance heuristics. They are written as
+free functions over plain integers and NumPy arrays so that Numba can compile
+them to machine code.
+
+Numba is optional. When it is not installed the kernels run as ordinary
+Python functions with identical results, only slower; build_neighbor_table
+is then replaced by a vectorized NumPy version. Running build_kernels.py
+compiles them ahead of time into grid_kernels_aot, which is used in
+preference to both when present.
+
+Functions:
+    _neighbors: Write the packed indices of a cell's free neighbors into a buffer
+    _manhattan: Manhattan distance between two cells
+    _euclid: Euclidean distance between two cells
+    build_neighbor_table: CSR table of the free neighbors of every cell
+    _build_neighbor_table_numpy: Vectorized build_neighbor_table for use without Numba
+    expand_node: Free neighbors of a cell together with their heuristic costs
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Neighbor offsets (dy, dx), including diagonal movements
+NEIGHBOR_OFFSETS = np.array([[0, 1], [1, 0], [0, -1], [-1, 0],
+                             [1, 1], [-1, -1], [1, -1], [-1, 1]], dtype=np.int64)
+
+
+@njit(nogil=True, cache=True)
+def _neighbors(grid, node, out):
+    """
+    Collect the free neighbors of a cell.
+
+    Cells are identified by their packed index y * width + x.
+
+    Args:
+        grid (np.ndarray): 2D uint8 grid (0: free, 1: obstacle)
+        node (int): Packed index of the cell
+        out (np.ndarray): (8,) int32 buffer receiving packed neighbor indices
+
+    Returns:
+        int: Number of neighbors written to the front of out
+    """
+    height, width = grid.shape
+    y, x = divmod(node, width)
+    count = 0
+    for k in range(NEIGHBOR_OFFSETS.shape[0]):
+        new_y = y + NEIGHBOR_OFFSETS[k, 0]
+        new_x = x + NEIGHBOR_OFFSETS[k, 1]
+        if 0 <= new_y < height and 0 <= new_x < width and grid[new_y, new_x] == 0:
+            out[count] = new_y * width + new_x
+            count += 1
+    return count
+
+
+@njit(nogil=True, cache=True)
+def _manhattan(y1, x1, y2, x2):
+    """Manhattan distance between (y1, x1) and (y2, x2)."""
+    return abs(y1 - y2) + abs(x1 - x2)
+
+
+@njit(nogil=True, cache=True)
+def _euclid(y1, x1, y2, x2):
+    """Euclidean distance between (y1, x1) and (y2, x2), in float32."""
+    return np.float32(math.sqrt((y1 - y2) ** 2 + (x1 - x2) ** 2))
+
+
+@njit(nogil=True, cache=True)
+def build_neighbor_table(grid):
+    """
+    Precompute the free neighbors of every cell in CSR form.
+
+    The neighbors of packed index i are indices[indptr[i]:indptr[i + 1]],
+    in the same order _neighbors produces them. Obstacle cells get an
+    empty range.
+
+    Args:
+        grid (np.ndarray): 2D uint8 grid (0: free, 1: obstacle)
+
+    Returns:
+        Tuple containing:
+        - np.ndarray: int32 offsets array of length height * width + 1
+        - np.ndarray: int32 array of packed neighbor indices
+    """
+    height, width = grid.shape
+    n_cells = height * width
+    n_offsets = NEIGHBOR_OFFSETS.shape[0]
+    indptr = np.zeros(n_cells + 1, dtype=np.int32)
+    indices = np.empty(n_cells * n_offsets, dtype=np.int32)
+    buffer = np.empty(n_offsets, dtype=np.int32)
+    total = 0
+    for node in range(n_cells):
+        if grid[node // width, node % width] == 0:
+            count = _neighbors(grid, node, buffer)
+            indices[total:total + count] = buffer[:count]
+            total += count
+        indptr[node + 1] = total
+    return indptr, indices[:total].copy()
+
+
+def _build_neighbor_table_numpy(grid):
+    """
+    Vectorized equivalent of build_neighbor_table for use without Numba.
+
+    Each offset in NEIGHBOR_OFFSETS becomes a fixed packed-index delta
+    dy * width + dx, valid where the shifted cell stays inside the grid and
+    both cells are free. Interpreted, the per-cell loop of
+    build_neighbor_table takes a noticeable fraction of a second on large
+    grids; this does the same work in a few array operations.
+
+    Args:
+        grid (np.ndarray): 2D uint8 grid (0: free, 1: obstacle)
+
+    Returns:
+        Tuple containing:
+        - np.ndarray: int32 offsets array of length height * width + 1
+        - np.ndarray: int32 array of packed neighbor indices
+    """
+    height, width = grid.shape
+    free = grid == 0
+    valid = np.zeros((height, width, len(NEIGHBOR_OFFSETS)), dtype=bool)
+    for k, (dy, dx) in enumerate(NEIGHBOR_OFFSETS.tolist()):
+        # Cells whose neighbor at (dy, dx) is inside the grid, as slices
+        rows = slice(max(-dy, 0), height - max(dy, 0))
+        cols = slice(max(-dx, 0), width - max(dx, 0))
+        shifted_rows = slice(max(dy, 0), height + min(dy, 0))
+        shifted_cols = slice(max(dx, 0), width + min(dx, 0))
+        valid[rows, cols, k] = free[rows, cols] & free[shifted_rows, shifted_cols]
+
+    deltas = NEIGHBOR_OFFSETS[:, 0] * width + NEIGHBOR_OFFSETS[:, 1]
+    node_ids = np.arange(height * width).reshape(height, width, 1)
+    # Row-major order over (y, x, k) keeps each cell's neighbors together
+    # and in NEIGHBOR_OFFSETS order, as build_neighbor_table produces them
+    indices = (node_ids + deltas)[valid].astype(np.int32)
+    indptr = np.zeros(height * width + 1, dtype=np.int32)
+    np.cumsum(valid.sum(axis=2).ravel(), out=indptr[1:])
+    return indptr, indices
+
+
+@njit(nogil=True, cache=True)
+def expand_node(indptr, indices, node, heuristic, out_ids, out_h):
+    """
+    Read the free neighbors of a cell together with their heuristic costs.
+
+    Neighbors come from the table built by build_neighbor_table and costs
+    from a heuristic precomputed for every cell, so an expansion is a few
+    contiguous reads with no bounds or obstacle checks, and a search makes
+    one call per expanded node instead of one per neighbor.
+
+    Args:
+        indptr (np.ndarray): CSR offsets from build_neighbor_table
+        indices (np.ndarray): CSR neighbor indices from build_neighbor_table
+        node (int): Packed index of the expanded cell
+        heuristic (np.ndarray): int32 heuristic cost of every packed index
+        out_ids (np.ndarray): (8,) int32 buffer receiving packed neighbor indices
+        out_h (np.ndarray): (8,) int32 buffer receiving each neighbor's heuristic
+
+    Returns:
+        int: Number of neighbors written to the front of the buffers
+    """
+    lo = indptr[node]
+    count = indptr[node + 1] - lo
+    for k in range(count):
+        neighbor = indices[lo + k]
+        out_ids[k] = neighbor
+        out_h[k] = heuristic[neighbor]
+    return count
+
+
+if not HAVE_NUMBA:
+    build_neighbor_table = _build_neighbor_table_numpy
+
+# Prefer the ahead-of-time compiled kernels from build_kernels.py: they need
+# neither a JIT warm-up on first use nor Numba at runtime
+try:
+    import grid_kernels_aot
+except ImportError:
+    grid_kernels_aot = None
+
+if grid_kernels_aot is not None:
+    build_neighbor_table = grid_kernels_aot.build_neighbor_table
+    expand_node = grid_kernels_aot.expand_node
+    _manhattan = grid_kernels_aot._manhattan
+    _euclid = grid_kernels_aot._euclid
@@ -11,7 +11,13 @@ Classes:
 
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Tuple, List, Set
+from functools import cached_property
+from typing import Tuple, List, Dict
+from matplotlib.colors import ListedColormap
+from grid_kernels import build_neighbor_table, _manhattan, _euclid
+
+# Colormap for the grid: white free cells, darker gray for obstacles
+OBSTACLE_CMAP = ListedColormap([[1, 1, 1, 1], [0.3, 0.3, 0.3, 1]])
 
 class GridWorld:
     """
@@ -23,9 +29,17 @@ class GridWorld:
     Attributes:
         width (int): Width of the grid
         height (int): Height of the grid
-        grid (np.ndarray): 2D array representing the grid (0: free, 1: obstacle)
+        grid (np.ndarray): 2D uint8 array representing the grid (0: free, 1: obstacle)
         start (Tuple[int, int]): Starting position (0,0)
         goal (Tuple[int, int]): Goal position (height-1, width-1)
+        start_id (int): Packed index of the start position
+        goal_id (int): Packed index of the goal position
+        csr_indptr (np.ndarray): Offsets into csr_indices for each packed index
+        csr_indices (np.ndarray): Packed indices of each cell's free neighbors
+        obstacle_count (int): Number of obstacle cells, computed on first access
+        obstacle_density (float): Proportion of obstacle cells, computed on first access
+        goal_heuristic (np.ndarray): Manhattan distance to the goal per packed index
+        start_heuristic (np.ndarray): Manhattan distance to the start per packed index
     """
 
     def __init__(self, width: int = 20, height: int = 20, obstacle_density: float = 0.3):
@@ -39,10 +53,15 @@ class GridWorld:
         """
         self.width = width
         self.height = height
-        self.grid = np.zeros((height, width))
+        self.grid = np.zeros((height, width), dtype=np.uint8)
         self.start = (0, 0)
         self.goal = (height-1, width-1)
+        self.start_id = self.pack(*self.start)
+        self.goal_id = self.pack(*self.goal)
         self._generate_obstacles(obstacle_density)
+        # The obstacles are fixed from here on, so every cell's neighbors
+        # can be looked up once instead of on each expansion
+        self.csr_indptr, self.csr_indices = build_neighbor_table(self.grid)
     
     def _generate_obstacles(self, density: float):
         """
@@ -51,14 +70,106 @@ class GridWorld:
         Args:
             density (float): Proportion of cells to be obstacles (0-1)
         """
-        n_obstacles = int(self.width * self.height * density)
-        obstacles = set()
-        while len(obstacles) < n_obstacles:
-            x = np.random.randint(0, self.width)
-            y = np.random.randint(0, self.height)
-            if (y, x) != self.start and (y, x) != self.goal:
-                obstacles.add((y, x))
-                self.grid[y, x] = 1
+        n_cells = self.width * self.height
+        # Draw every obstacle cell in one call from the linear indices that
+        # are neither the start nor the goal, so no cell is picked twice
+        candidates = np.setdiff1d(np.arange(n_cells), [self.start_id, self.goal_id])
+        n_obstacles = min(int(n_cells * density), len(candidates))
+        idx = np.random.choice(candidates, size=n_obstacles, replace=False)
+        self.grid.reshape(-1)[idx] = 1
+
+    @cached_property
+    def obstacle_count(self) -> int:
+        """
+        Number of obstacle cells in the grid.
+        
+        Computed once on first access; the obstacles never change after
+        the grid is created.
+        
+        Returns:
+            int: Number of obstacle cells
+        """
+        return int(np.count_nonzero(self.grid))
+
+    @cached_property
+    def obstacle_density(self) -> float:
+        """
+        Proportion of the grid's cells that are obstacles.
+        
+        Returns:
+            float: Obstacle count divided by the number of cells (0-1)
+        """
+        return self.obstacle_count / (self.width * self.height)
+
+    def manhattan_grid(self, pos: Tuple[int, int]) -> np.ndarray:
+        """
+        Calculate the Manhattan distance from every cell to a position.
+        
+        Args:
+            pos (Tuple[int, int]): Target position (y, x)
+        
+        Returns:
+            np.ndarray: int32 distances, flat and indexed by packed index
+        """
+        rows, cols = np.indices((self.height, self.width))
+        return (np.abs(rows - pos[0]) + np.abs(cols - pos[1])).astype(np.int32).ravel()
+
+    @cached_property
+    def goal_heuristic(self) -> np.ndarray:
+        """
+        Manhattan distance from every cell to the goal, computed once.
+        
+        Returns:
+            np.ndarray: int32 distances, flat and indexed by packed index
+        """
+        return self.manhattan_grid(self.goal)
+
+    @cached_property
+    def start_heuristic(self) -> np.ndarray:
+        """
+        Manhattan distance from every cell to the start, computed once.
+        
+        Returns:
+            np.ndarray: int32 distances, flat and indexed by packed index
+        """
+        return self.manhattan_grid(self.start)
+
+    def pack(self, y: int, x: int) -> int:
+        """
+        Convert a position to its packed index y * width + x.
+        
+        Args:
+            y (int): Row of the position
+            x (int): Column of the position
+        
+        Returns:
+            int: Packed index of the position
+        """
+        return y * self.width + x
+
+    def unpack(self, i: int) -> Tuple[int, int]:
+        """
+        Convert a packed index back to its position.
+        
+        Args:
+            i (int): Packed index of the position
+        
+        Returns:
+            Tuple[int, int]: The position (y, x)
+        """
+        return divmod(i, self.width)
+
+    def get_neighbor_ids(self, node: int) -> np.ndarray:
+        """
+        Get the packed indices of the valid neighbors of a packed index.
+        
+        Args:
+            node (int): Packed index of the current position
+        
+        Returns:
+            np.ndarray: int32 array of packed neighbor indices
+        """
+        return self.csr_indices[self.csr_indptr[node]:self.csr_indptr[node + 1]]
 
     def get_neighbors(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
         """
@@ -70,16 +181,7 @@ class GridWorld:
         Returns:
             List[Tuple[int, int]]: List of valid neighbor positions
         """
-        y, x = pos
-        neighbors = []
-        # Include diagonal movements
-        for dy, dx in [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]:
-            new_y, new_x = y + dy, x + dx
-            if (0 <= new_y < self.height and 
-                0 <= new_x < self.width and 
-                self.grid[new_y, new_x] == 0):
-                neighbors.append((new_y, new_x))
-        return neighbors
+        return [divmod(i, self.width) for i in self.get_neighbor_ids(self.pack(*pos)).tolist()]
 
     def manhattan_distance(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
         """
@@ -92,7 +194,7 @@ class GridWorld:
         Returns:
             float: Manhattan distance between the positions
         """
-        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+        return _manhattan(pos1[0], pos1[1], pos2[0], pos2[1])
 
     def euclidean_distance(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
         """
@@ -103,83 +205,86 @@ class GridWorld:
             pos2 (Tuple[int, int]): Second position (y2, x2)
         
         Returns:
-            float: Euclidean distance between the positions
+            float: Euclidean distance between the positions (float32 precision)
         """
-        return np.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
+        return float(_euclid(pos1[0], pos1[1], pos2[0], pos2[1]))
 
     def visualize(self, path: List[Tuple[int, int]] = None, 
-                 explored: Set[Tuple[int, int]] = None,
+                 explored: np.ndarray = None,
                  title: str = "Grid World",
-                 ax = None):
+                 ax = None) -> Dict[str, object]:
         """
         Visualize the grid, path, and explored nodes.
         
+        The explored scatter and path collection are always created, empty
+        when there is nothing to show, so callers can keep the returned
+        artists and redraw new results with update_visualization.
+        
+        Colorbars are only added when plotting on the current pyplot axes.
+        Callers passing their own axes attach colorbars themselves, once,
+        so that redraws do not rebuild them.
+        
         Args:
             path (List[Tuple[int, int]], optional): Path to visualize
-            explored (Set[Tuple[int, int]], optional): Set of explored nodes
+            explored (np.ndarray, optional): Packed indices of the explored nodes
             title (str, optional): Title for the plot
             ax (matplotlib.axes.Axes, optional): Axes to plot on
+        
+        Returns:
+            Dict[str, object]: The created artists keyed by 'grid', 'explored',
+            'path', 'start' and 'goal'
         """
         # Use provided axes or current axes
-        if ax is None:
+        standalone = ax is None
+        if standalone:
             ax = plt.gca()
         
         # Clear current axes
         ax.clear()
         
-        # Create custom colormap for obstacles
-        obstacle_cmap = plt.cm.Greys(np.linspace(0, 1, 2))
-        obstacle_cmap[1] = [0.3, 0.3, 0.3, 1]  # Darker gray for obstacles
-        
         # Plot the grid
-        ax.imshow(self.grid, cmap=plt.matplotlib.colors.ListedColormap(obstacle_cmap), alpha=0.3)
+        image = ax.imshow(self.grid, cmap=OBSTACLE_CMAP, alpha=0.3)
         
         # Add grid lines
         ax.grid(True, color='gray', alpha=0.3, linestyle='-', linewidth=0.5)
         
-        # Plot explored nodes with a gradient based on exploration order
-        if explored:
-            explored_y, explored_x = zip(*explored)
-            scatter = ax.scatter(explored_x, explored_y, 
-                               c=range(len(explored)), cmap='Blues',
-                               alpha=0.3, s=50)
-            
+        # Explored nodes with a gradient based on exploration order
+        scatter = ax.scatter([], [], c=[], cmap='Blues', alpha=0.3, s=50)
+        
+        # Path with a gradient color
+        lc = plt.matplotlib.collections.LineCollection(
+            [], cmap='viridis', linewidth=3, alpha=0.8
+        )
+        ax.add_collection(lc)
+
+        # Plot start and goal with distinctive markers
+        start_marker, = ax.plot(self.start[1], self.start[0], 
+                                marker='*', color='#2ecc71', 
+                                markersize=15, label='Start',
+                                markeredgecolor='white', markeredgewidth=1.5)
+        
+        goal_marker, = ax.plot(self.goal[1], self.goal[0], 
+                               marker='*', color='#e74c3c',
+                               markersize=15, label='Goal',
+                               markeredgecolor='white', markeredgewidth=1.5)
+
+        artists = {
+            'grid': image,
+            'explored': scatter,
+            'path': lc,
+            'start': start_marker,
+            'goal': goal_marker
+        }
+        self.update_visualization(artists, path, explored, title)
+        
+        if standalone:
             # Add colorbar for exploration order
-            if len(explored) > 100:  # Only add colorbar for significant exploration
+            if explored is not None and len(explored) > 100:  # Only add colorbar for significant exploration
                 plt.colorbar(scatter, ax=ax, label='Exploration Order')
-
-        # Plot the path with a gradient color
-        if path:
-            path_y, path_x = zip(*path)
-            points = np.array([path_x, path_y]).T.reshape(-1, 1, 2)
-            segments = np.concatenate([points[:-1], points[1:]], axis=1)
-            
-            # Create a gradient color for the path
-            norm = plt.Normalize(0, len(path))
-            lc = plt.matplotlib.collections.LineCollection(
-                segments, cmap='viridis',
-                norm=norm, linewidth=3, alpha=0.8
-            )
-            lc.set_array(np.linspace(0, len(path), len(path)))
-            ax.add_collection(lc)
             
             # Add colorbar for path progression
-            if len(path) > 20:  # Only add colorbar for longer paths
+            if path is not None and len(path) > 20:  # Only add colorbar for longer paths
                 plt.colorbar(lc, ax=ax, label='Path Progression')
-
-        # Plot start and goal with distinctive markers
-        ax.plot(self.start[1], self.start[0], 
-                marker='*', color='#2ecc71', 
-                markersize=15, label='Start',
-                markeredgecolor='white', markeredgewidth=1.5)
-        
-        ax.plot(self.goal[1], self.goal[0], 
-                marker='*', color='#e74c3c',
-                markersize=15, label='Goal',
-                markeredgecolor='white', markeredgewidth=1.5)
-
-        # Customize the plot
-        ax.set_title(title, pad=10, fontsize=10, fontweight='bold')
         
         # Remove axis labels and ticks
         ax.set_xticks([])
@@ -190,4 +295,54 @@ class GridWorld:
             ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
         
         # Ensure proper layout
-        ax.set_aspect('equal') 
\ No newline at end of file
+        ax.set_aspect('equal')
+        
+        return artists
+
+    def update_visualization(self, artists: Dict[str, object],
+                             path: List[Tuple[int, int]] = None,
+                             explored: np.ndarray = None,
+                             title: str = None):
+        """
+        Redraw a path and explored nodes on artists created by visualize.
+        
+        The artists are updated in place, so repeated redraws of the same
+        grid avoid clearing the axes and rebuilding the image and markers.
+        Colorbars attached to the explored scatter or the path collection
+        follow their new color limits without being recreated.
+        
+        Args:
+            artists (Dict[str, object]): Artists returned by visualize
+            path (List[Tuple[int, int]], optional): Path to visualize
+            explored (np.ndarray, optional): Packed indices of the explored nodes
+            title (str, optional): New title for the plot
+        """
+        scatter = artists['explored']
+        lc = artists['path']
+        ax = scatter.axes
+        
+        # Plot explored nodes with a gradient based on exploration order
+        if explored is None:
+            explored = np.empty(0, dtype=np.int32)
+        n_explored = len(explored)
+        explored_y, explored_x = np.divmod(explored, self.width)
+        scatter.set_offsets(np.column_stack([explored_x, explored_y]))
+        scatter.set_array(np.arange(n_explored))
+        scatter.set_clim(0, max(n_explored - 1, 1))
+        
+        # Plot the path with a gradient color
+        n_path = len(path) if path is not None else 0
+        if n_path > 1:
+            # (x, y) points in float32, viewed as overlapping point pairs
+            # without copying; LineCollection accepts float32 directly
+            points = np.asarray(path, dtype=np.float32)[:, ::-1]
+            segments = np.lib.stride_tricks.sliding_window_view(points, (2, 2)).reshape(-1, 2, 2)
+        else:
+            segments = []
+        lc.set_segments(segments)
+        lc.set_array(np.linspace(0, n_path, n_path))
+        lc.set_clim(0, max(n_path, 1))
+
+        # Customize the plot
+        if title is not None:
+            ax.set_title(title, pad=10, fontsize=10, fontweight='bold')
@@ -1,8 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib
 # Force Agg backend before importing pyplot
 matplotlib.use('Agg')
+# Let the renderer decimate long path lines
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
@@ -33,6 +37,11 @@ class PathfindingUI:
         self.canvas = None
         self.toolbar = None
         self.last_results = {}
+        # Artists of the single-grid view, reused between redraws
+        self.grid_artists = None
+        # Worker threads running the searches of "Compare All Algorithms"
+        self.executor = ThreadPoolExecutor(max_workers=3)
+        self.pending_comparison = None
 
         # Create initial figure
         self.current_figure = Figure(figsize=(8, 8))
@@ -46,6 +55,7 @@ class PathfindingUI:
     def _on_closing(self):
         """Handle window closing event"""
         try:
+            self.executor.shutdown(wait=False)
             plt.close('all')  # Close all matplotlib figures
             self.root.quit()
             self.root.destroy()
@@ -211,12 +221,13 @@ class PathfindingUI:
                 obstacle_density=float(self.obstacle_density_var.get())
             )
             self.pathfinder = PathFinder(self.grid)
+            self.grid_artists = None
             self._display_grid()
             
             # Update statistics
-            obstacle_count = sum(sum(row) for row in self.grid.grid)
+            obstacle_count = self.grid.obstacle_count
             grid_size = self.grid.width * self.grid.height
-            density = obstacle_count / grid_size
+            density = self.grid.obstacle_density
             
             stats_text = f"Grid Size: {self.grid.width}x{self.grid.height}\n"
             stats_text += f"Obstacles: {obstacle_count} ({density:.1%})\n"
@@ -235,22 +246,32 @@ class PathfindingUI:
             messagebox.showerror("Error", f"Failed to create grid: {str(e)}")
 
     def _display_grid(self, path=None, explored=None, title="Grid World"):
-        """Display grid with improved error handling and cleanup"""
+        """Display grid, reusing the existing artists when only results change"""
         try:
-            # Clear the current figure
-            self.current_figure.clear()
-            ax = self.current_figure.add_subplot(111)
-            
-            # Draw on the figure
-            if self.grid:
-                self.grid.visualize(path, explored, title, ax)
+            if self.grid_artists is None:
+                # Build the figure from scratch for a new grid or layout
+                self.current_figure.clear()
+                ax = self.current_figure.add_subplot(111)
+                if self.grid:
+                    self.grid_artists = self.grid.visualize(path, explored, title, ax)
+                    # Colorbars are created once per layout; later redraws
+                    # only change the color limits they follow
+                    self.current_figure.colorbar(self.grid_artists['explored'], ax=ax,
+                                                 location='bottom', fraction=0.04, pad=0.1,
+                                                 label='Exploration Order')
+                    self.current_figure.colorbar(self.grid_artists['path'], ax=ax,
+                                                 location='bottom', fraction=0.04, pad=0.02,
+                                                 label='Path Progression')
+            else:
+                # Same grid, so only the path and explored nodes need updating
+                self.grid.update_visualization(self.grid_artists, path, explored, title)
             
             # Update canvas
             if self.canvas:
-                self.canvas.draw()
+                self.canvas.draw_idle()
             else:
                 self.canvas = FigureCanvasTkAgg(self.current_figure, self.fig_frame)
-                self.canvas.draw()
+                self.canvas.draw_idle()
                 
                 # Add toolbar if it doesn't exist
                 if not self.toolbar:
@@ -321,41 +342,74 @@ class PathfindingUI:
         self.results_text.see(tk.END)
 
     def _compare_all(self):
-        """Compare all algorithms with improved error handling"""
+        """Compare all algorithms, running the searches in worker threads"""
         if not self.grid or not self.pathfinder:
             messagebox.showerror("Error", "Please create a grid first!")
             return
+        if self.pending_comparison:
+            return
 
         try:
             self.root.config(cursor="watch")
-            self.root.update()
             
             # Clear previous results
             self.results_text.delete(1.0, tk.END)
             
+            # Read Tk variables here; they must not be touched from workers
+            beam_width = int(self.beam_width_var.get())
+            adaptive = self.adaptive_beam_var.get()
+            pathfinder = self.pathfinder
             algorithms = {
-                "A*": self.pathfinder.astar_search,
-                "Greedy": self.pathfinder.greedy_search,
-                "B*": lambda: self.pathfinder.beam_search(
-                    beam_width=int(self.beam_width_var.get()),
-                    adaptive=self.adaptive_beam_var.get()
+                "A*": pathfinder.astar_search,
+                "Greedy": pathfinder.greedy_search,
+                "B*": lambda: pathfinder.beam_search(
+                    beam_width=beam_width,
+                    adaptive=adaptive
                 )
             }
 
+            # The grid is never modified by a search, so all three can run
+            # concurrently while the Tk event loop stays responsive
+            futures = [(name, self.executor.submit(algo)) for name, algo in algorithms.items()]
+            self.pending_comparison = (self.grid, futures)
+            self.root.after(20, self._poll_comparison)
+        except Exception as e:
+            self.root.config(cursor="")
+            messagebox.showerror("Comparison Error", f"Failed to compare algorithms: {str(e)}")
+
+    def _poll_comparison(self):
+        """Wait for the comparison searches, then display their results"""
+        grid, futures = self.pending_comparison
+        if not all(future.done() for _, future in futures):
+            self.root.after(20, self._poll_comparison)
+            return
+        self.pending_comparison = None
+
+        try:
+            # Drop results computed for a grid that has since been replaced
+            if grid is not self.grid:
+                return
+
             results = []
-            for name, algo in algorithms.items():
-                path, explored, nodes = algo()
+            for name, future in futures:
+                path, explored, nodes = future.result()
                 results.append((name, path, explored, nodes))
                 self._update_results(name, path, explored, nodes)
 
             # Create new figure for comparison
             self.current_figure.clear()
+            self.grid_artists = None
             gs = self.current_figure.add_gridspec(2, 3, height_ratios=[3, 1])
             
             # Plot paths in the top row
             for i, (name, path, explored, nodes) in enumerate(results):
                 ax = self.current_figure.add_subplot(gs[0, i])
-                self.grid.visualize(path, explored, f"{name} Search", ax)
+                artists = self.grid.visualize(path, explored, f"{name} Search", ax)
+                # Only add colorbars for significant exploration and longer paths
+                if len(explored) > 100:
+                    self.current_figure.colorbar(artists['explored'], ax=ax, label='Exploration Order')
+                if path and len(path) > 20:
+                    self.current_figure.colorbar(artists['path'], ax=ax, label='Path Progression')
                 ax.set_title(f"{name}\nNodes: {nodes}\nPath: {len(path) if path else 'No path'}")
             
             # Plot performance comparison in bottom row
@@ -365,15 +419,14 @@ class PathfindingUI:
             self.current_figure.tight_layout()
             
             if self.canvas:
-                self.canvas.draw()
+                self.canvas.draw_idle()
             
             # Show detailed comparison
             self._show_detailed_comparison(results)
-            
-            self.root.config(cursor="")
         except Exception as e:
-            self.root.config(cursor="")
             messagebox.showerror("Comparison Error", f"Failed to compare algorithms: {str(e)}")
+        finally:
+            self.root.config(cursor="")
 
     def _plot_performance_comparison(self, results, ax):
         """Plot performance metrics comparison"""
@@ -416,9 +469,6 @@ class PathfindingUI:
         
         # Add grid
         ax.grid(True, alpha=0.3)
-        
-        # Adjust layout
-        plt.tight_layout()
 
     def _show_detailed_comparison(self, results):
         """Show detailed comparison metrics in the results text area"""
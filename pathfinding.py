@@ -2,7 +2,7 @@
 Pathfinding Algorithms Implementation
 
 This module implements three different pathfinding algorithms:
-1. A* Search - Optimal pathfinding using both cost and heuristic
+1. A* Search - Pathfinding using both cost and heuristic
 2. Greedy Best-First Search - Fast pathfinding using only heuristic
 3. B* Search (Beam Search) - Memory-efficient search with limited branching
 
@@ -10,11 +10,30 @@ Each algorithm provides path finding capabilities in a grid-based environment
 with performance metrics including nodes explored and expanded.
 """
 
-from typing import List, Tuple, Set, Dict
+from typing import List, Optional, Tuple
 import heapq
+import threading
 from grid_world import GridWorld
+from grid_kernels import HAVE_NUMBA, NEIGHBOR_OFFSETS, expand_node
+from pathfinding_numba import (HAVE_COMPILED_SEARCH, astar_core, astar_bidirectional_core,
+                               astar_bidirectional_parallel)
 import numpy as np
 
+# Cython build of the search loops for installs without Numba (see setup.py)
+try:
+    from _astar import astar_core as cython_astar_core
+    from _astar import astar_bidirectional_core as cython_astar_bidirectional_core
+except ImportError:
+    cython_astar_core = cython_astar_bidirectional_core = None
+
+# g-score of nodes the search has not reached yet
+UNREACHED = np.iinfo(np.int32).max
+
+# Grid size (width + height) from which astar_search runs bidirectionally
+# by default. Start and goal are opposite corners, so only grids smaller
+# than 11x11 stay one-directional
+BIDIRECTIONAL_MIN_SIZE = 22
+
 class PathFinder:
     """
     A class implementing various pathfinding algorithms.
@@ -23,6 +42,11 @@ class PathFinder:
     that can be used to find paths in a GridWorld environment. Each algorithm
     returns the found path along with performance metrics.
     
+    Internally nodes are identified by their packed index y * width + x.
+    Paths are converted back to (y, x) positions when a search returns;
+    explored nodes are returned as an array of packed indices, which
+    GridWorld.visualize unpacks in one vectorized step.
+    
     Attributes:
         grid (GridWorld): The grid environment to perform pathfinding in
     """
@@ -35,107 +59,342 @@ class PathFinder:
             grid_world (GridWorld): The grid environment to perform pathfinding in
         """
         self.grid = grid_world
+        self._scratch = threading.local()
+
+    def _search_buffers(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get this thread's reusable search buffers, reset for a new search.
+        
+        The buffers are allocated on the first search and then reused, so
+        repeated searches on the same grid do not reallocate them. They are
+        kept per thread because the UI runs different searches on the same
+        PathFinder concurrently.
+        
+        Returns:
+            Tuple containing:
+            - np.ndarray: (8,) int32 buffer for packed neighbor indices
+            - np.ndarray: (8,) int32 buffer for neighbor heuristic costs
+            - np.ndarray: int32 g-score per packed index, reset to UNREACHED
+        """
+        buffers = getattr(self._scratch, 'buffers', None)
+        if buffers is None:
+            n = len(NEIGHBOR_OFFSETS)
+            buffers = (np.empty(n, dtype=np.int32),
+                       np.empty(n, dtype=np.int32),
+                       np.empty(self.grid.width * self.grid.height, dtype=np.int32))
+            self._scratch.buffers = buffers
+        buffers[2].fill(UNREACHED)
+        return buffers
+
+    def _search_state(self) -> Tuple[List[int], bytearray, List[int]]:
+        """
+        Allocate the per-search node state.
+        
+        Predecessors and closed flags are flat and indexed by packed index.
+        A list and a bytearray are used rather than NumPy arrays because the
+        interpreted search loops read and write them one element at a time,
+        which is several times faster on Python containers than on arrays.
+        Expanded nodes are also appended to a list when first closed, which
+        gives the explored array in expansion order without scanning the
+        closed flags of the whole grid.
+        
+        Returns:
+            Tuple containing:
+            - List[int]: Predecessor of each packed index, -1 if it has none
+            - bytearray: Closed flag of each packed index, 1 once expanded
+            - List[int]: Packed indices in the order they were first expanded
+        """
+        n_cells = self.grid.width * self.grid.height
+        return [-1] * n_cells, bytearray(n_cells), []
 
-    def _reconstruct_path(self, came_from: Dict, current: Tuple[int, int]) -> List[Tuple[int, int]]:
+    def _reconstruct_path(self, came_from: List[int], current: int) -> List[Tuple[int, int]]:
         """
-        Reconstruct the path from start to goal using the came_from dictionary.
+        Reconstruct the path from start to goal using the came_from array.
         
         Args:
-            came_from (Dict): Dictionary mapping each position to its predecessor
-            current (Tuple[int, int]): Current position (usually the goal)
+            came_from (List[int]): Predecessor of each packed index, -1 if it has none
+            current (int): Packed index of the current position (usually the goal)
         
         Returns:
             List[Tuple[int, int]]: The reconstructed path from start to goal
         """
         path = [current]
-        while current in came_from:
+        while came_from[current] != -1:
             current = came_from[current]
             path.append(current)
-        return path[::-1]
+        width = self.grid.width
+        return [divmod(node, width) for node in reversed(path)]
 
-    def astar_search(self) -> Tuple[List[Tuple[int, int]], Set[Tuple[int, int]], int]:
+    @staticmethod
+    def _explored_array(explored: List[int]) -> np.ndarray:
+        """
+        Convert the list of explored packed indices to the returned array.
+        
+        Args:
+            explored (List[int]): Packed indices of the explored nodes, in expansion order
+        
+        Returns:
+            np.ndarray: int32 array of the explored packed indices
+        """
+        return np.array(explored, dtype=np.int32)
+
+    def astar_search(self, bidirectional: Optional[bool] = None) -> Tuple[List[Tuple[int, int]], np.ndarray, int]:
         """
         Perform A* Search algorithm.
         
         A* Search combines actual path cost with a heuristic estimate to find
-        the optimal path. It guarantees the shortest path when using an
-        admissible heuristic.
+        a short path. Its Manhattan distance heuristic overestimates the cost
+        of diagonal moves, so the path returned is not guaranteed to be the
+        shortest one.
+        
+        Unless bidirectional says otherwise, grids whose width + height is
+        at least BIDIRECTIONAL_MIN_SIZE are handed to astar_bidirectional.
+        As start and goal are opposite corners this is a cutoff on grid
+        size, and it covers all but the smallest grids. The large win is
+        on grids where the goal is unreachable, where the bidirectional
+        search expands about a tenth as many nodes. On open random grids
+        both expand about as many nodes, though the one-directional search
+        occasionally expands many times more; on grids crossed by long
+        walls the bidirectional search expands about twice as many.
+        
+        The rest of this description applies to the one-directional search.
+        Expanded nodes are closed for good: a neighbor that has already
+        been expanded is skipped without comparing g_scores. With a
+        consistent heuristic no shorter path to such a node can turn up
+        later, so this only saves work. Manhattan distance is consistent on
+        4-connected grids but not with the diagonal moves used here, so
+        neither this nor reopening nodes makes the path shortest; reopening
+        only made the search expand some nodes many times over on large
+        grids.
+        
+        The search returns as soon as an expansion reaches the goal, rather
+        than after pushing the goal and popping it again. The goal has the
+        lowest possible heuristic, so it would almost always be the next
+        node popped anyway.
+        
+        Args:
+            bidirectional (bool, optional): Run astar_bidirectional (True) or
+                the one-directional search (False); chosen by grid size if
+                None (default: None)
         
         Returns:
             Tuple containing:
             - List[Tuple[int, int]]: The found path (empty if no path exists)
-            - Set[Tuple[int, int]]: Set of explored nodes
+            - np.ndarray: int32 packed indices (y * width + x) of explored nodes
             - int: Number of nodes expanded
         """
-        start = self.grid.start
-        goal = self.grid.goal
-        
-        frontier = [(0, start)]  # Priority queue of (f_score, position)
-        came_from = {}
-        cost_so_far = {start: 0}  # g_score
-        explored = set()
+        if bidirectional is None:
+            bidirectional = self.grid.width + self.grid.height >= BIDIRECTIONAL_MIN_SIZE
+        if bidirectional:
+            return self.astar_bidirectional()
+
+        start = self.grid.start_id
+        goal = self.grid.goal_id
+
+        core = astar_core if HAVE_COMPILED_SEARCH else cython_astar_core
+        if core is not None:
+            # Run the whole search as compiled code; only the path is
+            # converted back to (y, x) positions
+            path, explored, nodes_expanded = core(self.grid.csr_indptr, self.grid.csr_indices,
+                                                  self.grid.goal_heuristic, start, goal)
+            return [divmod(node, self.grid.width) for node in path.tolist()], explored, int(nodes_expanded)
+
+        # Priority queue of (f_score, packed index, g_score). A node is pushed
+        # again whenever its g_score improves and the older entry is left in
+        # place; it is skipped when popped because its g_score is out of date.
+        frontier = [(0, start, 0)]
+        came_from, closed, explored = self._search_state()
+        neighbor_ids, h_costs, g_score = self._search_buffers()
+        heuristic = self.grid.goal_heuristic
+        g_score[start] = 0
         nodes_expanded = 0
+        # Grid attributes used on every expansion, looked up once
+        indptr, indices = self.grid.csr_indptr, self.grid.csr_indices
 
         while frontier:
-            _, current = heapq.heappop(frontier)
+            _, current, cost = heapq.heappop(frontier)
+            if cost > g_score.item(current):
+                continue
             
             if current == goal:
-                return self._reconstruct_path(came_from, goal), explored, nodes_expanded
+                return self._reconstruct_path(came_from, goal), self._explored_array(explored), nodes_expanded
             
-            explored.add(current)
+            closed[current] = 1
+            explored.append(current)
             nodes_expanded += 1
 
-            for next_pos in self.grid.get_neighbors(current):
-                new_cost = cost_so_far[current] + 1
-                
-                if next_pos not in cost_so_far or new_cost < cost_so_far[next_pos]:
-                    cost_so_far[next_pos] = new_cost
+            count = expand_node(indptr, indices, current, heuristic, neighbor_ids, h_costs)
+            new_cost = cost + 1
+            for next_pos, h in zip(neighbor_ids[:count].tolist(), h_costs[:count].tolist()):
+                if closed[next_pos]:
+                    continue
+                if new_cost < g_score.item(next_pos):
+                    g_score[next_pos] = new_cost
                     # f_score = g_score + heuristic
-                    priority = new_cost + self.grid.manhattan_distance(next_pos, goal)
-                    heapq.heappush(frontier, (priority, next_pos))
+                    priority = new_cost + h
+                    heapq.heappush(frontier, (priority, next_pos, new_cost))
                     came_from[next_pos] = current
+            # One check per expansion instead of one per neighbor
+            if came_from[goal] == current:
+                return self._reconstruct_path(came_from, goal), self._explored_array(explored), nodes_expanded
         
-        return [], explored, nodes_expanded
+        return [], self._explored_array(explored), nodes_expanded
 
-    def greedy_search(self) -> Tuple[List[Tuple[int, int]], Set[Tuple[int, int]], int]:
+    def astar_bidirectional(self, parallel: bool = False) -> Tuple[List[Tuple[int, int]], np.ndarray, int]:
+        """
+        Perform bidirectional A* Search algorithm.
+        
+        Runs one A* search forward from the start and one backward from the
+        goal, alternating one expansion per side. Whenever a node has been
+        reached from both sides, the path through it is a candidate meeting
+        point. The search stops once the lowest f_score on either frontier
+        is no better than the cheapest meeting found. With an admissible
+        heuristic no path through that frontier could improve on it; with
+        the overestimating Manhattan distance the meeting is a short path
+        rather than a guaranteed shortest one. As in astar_search, neither
+        side reopens nodes it has already expanded.
+        
+        With parallel=True and Numba installed, the two sides run at the
+        same time in separate threads instead of alternating. This is
+        experimental and never chosen by astar_search. Starting the
+        threads costs more than a typical search on grids of a few hundred
+        cells across, so this only pays off when both sides expand many
+        nodes, and the expansion count and path can vary between runs.
+        
+        Args:
+            parallel (bool): Run the two sides in parallel threads (default: False)
+        
+        Returns:
+            Tuple containing:
+            - List[Tuple[int, int]]: The found path (empty if no path exists)
+            - np.ndarray: int32 packed indices (y * width + x) of explored nodes
+            - int: Number of nodes expanded
+        """
+        start = self.grid.start_id
+        goal = self.grid.goal_id
+
+        if HAVE_COMPILED_SEARCH:
+            core = astar_bidirectional_parallel if parallel and HAVE_NUMBA else astar_bidirectional_core
+        else:
+            core = cython_astar_bidirectional_core
+        if core is not None:
+            path, explored, nodes_expanded = core(
+                self.grid.csr_indptr, self.grid.csr_indices, self.grid.goal_heuristic,
+                self.grid.start_heuristic, start, goal)
+            return [divmod(node, self.grid.width) for node in path.tolist()], explored, int(nodes_expanded)
+
+        neighbor_ids, h_costs, g_forward = self._search_buffers()
+        g_backward = np.full_like(g_forward, UNREACHED)
+        g_forward[start] = 0
+        g_backward[goal] = 0
+        # Per side: frontier of (f_score, packed index, g_score) as in
+        # astar_search, g-scores, predecessors, the other side's g-scores,
+        # the heuristic towards the other side's root and closed flags.
+        # seen marks the nodes already in explored, from either side
+        came_from_forward, seen, explored = self._search_state()
+        n_cells = len(came_from_forward)
+        forward = ([(0, start, 0)], g_forward, came_from_forward, g_backward, self.grid.goal_heuristic,
+                   bytearray(n_cells))
+        backward = ([(0, goal, 0)], g_backward, [-1] * n_cells, g_forward, self.grid.start_heuristic,
+                    bytearray(n_cells))
+        nodes_expanded = 0
+        best_cost = UNREACHED
+        meet = None
+        indptr, indices = self.grid.csr_indptr, self.grid.csr_indices
+
+        side = forward
+        while forward[0] and backward[0]:
+            # No path through either frontier can beat the best meeting found
+            if max(forward[0][0][0], backward[0][0][0]) >= best_cost:
+                break
+
+            frontier, g_score, came_from, g_other, heuristic, closed = side
+            _, current, cost = heapq.heappop(frontier)
+            if cost > g_score.item(current):
+                continue
+            # As in astar_search, a side never reopens nodes it has expanded
+            closed[current] = 1
+            if not seen[current]:
+                seen[current] = 1
+                explored.append(current)
+            nodes_expanded += 1
+            if cost + g_other.item(current) < best_cost:
+                best_cost = cost + g_other.item(current)
+                meet = current
+
+            count = expand_node(indptr, indices, current, heuristic, neighbor_ids, h_costs)
+            new_cost = cost + 1
+            for next_pos, h in zip(neighbor_ids[:count].tolist(), h_costs[:count].tolist()):
+                if closed[next_pos]:
+                    continue
+                if new_cost < g_score.item(next_pos):
+                    g_score[next_pos] = new_cost
+                    heapq.heappush(frontier, (new_cost + h, next_pos, new_cost))
+                    came_from[next_pos] = current
+                    if new_cost + g_other.item(next_pos) < best_cost:
+                        best_cost = new_cost + g_other.item(next_pos)
+                        meet = next_pos
+            side = backward if side is forward else forward
+
+        if meet is None:
+            return [], self._explored_array(explored), nodes_expanded
+        # start -> meet, then meet -> goal along the backward predecessors
+        head = self._reconstruct_path(forward[2], meet)
+        tail = self._reconstruct_path(backward[2], meet)[::-1]
+        return head + tail[1:], self._explored_array(explored), nodes_expanded
+
+    def greedy_search(self) -> Tuple[List[Tuple[int, int]], np.ndarray, int]:
         """
         Perform Greedy Best-First Search algorithm.
         
         Greedy Best-First Search uses only the heuristic to guide the search,
         making it faster but not guaranteed to find the optimal path.
         
+        The goal is the only node with a heuristic of zero, so it would be
+        popped right after it is queued; the search returns when it is
+        queued instead.
+        
         Returns:
             Tuple containing:
             - List[Tuple[int, int]]: The found path (empty if no path exists)
-            - Set[Tuple[int, int]]: Set of explored nodes
+            - np.ndarray: int32 packed indices (y * width + x) of explored nodes
             - int: Number of nodes expanded
         """
-        start = self.grid.start
-        goal = self.grid.goal
+        start = self.grid.start_id
+        goal = self.grid.goal_id
         
-        frontier = [(self.grid.manhattan_distance(start, goal), start)]
-        came_from = {}
-        explored = set()
+        heuristic = self.grid.goal_heuristic
+        frontier = [(heuristic.item(start), start)]
+        # Greedy search expands each node at most once, so instead of closed
+        # flags it tracks packed indices ever pushed: each is either still in
+        # the frontier or already expanded, so neither needs queueing again
+        came_from, queued, explored = self._search_state()
+        queued[start] = 1
         nodes_expanded = 0
+        neighbor_ids, h_costs, _ = self._search_buffers()
+        indptr, indices = self.grid.csr_indptr, self.grid.csr_indices
 
         while frontier:
             _, current = heapq.heappop(frontier)
             
             if current == goal:
-                return self._reconstruct_path(came_from, goal), explored, nodes_expanded
+                return self._reconstruct_path(came_from, goal), self._explored_array(explored), nodes_expanded
             
-            explored.add(current)
+            explored.append(current)
             nodes_expanded += 1
 
-            for next_pos in self.grid.get_neighbors(current):
-                if next_pos not in explored and next_pos not in [pos for _, pos in frontier]:
-                    priority = self.grid.manhattan_distance(next_pos, goal)
-                    heapq.heappush(frontier, (priority, next_pos))
+            count = expand_node(indptr, indices, current, heuristic, neighbor_ids, h_costs)
+            for next_pos, h in zip(neighbor_ids[:count].tolist(), h_costs[:count].tolist()):
+                if not queued[next_pos]:
+                    heapq.heappush(frontier, (h, next_pos))
+                    queued[next_pos] = 1
                     came_from[next_pos] = current
+            if came_from[goal] == current:
+                return self._reconstruct_path(came_from, goal), self._explored_array(explored), nodes_expanded
         
-        return [], explored, nodes_expanded
+        return [], self._explored_array(explored), nodes_expanded
 
-    def beam_search(self, beam_width: int = 5, adaptive: bool = True) -> Tuple[List[Tuple[int, int]], Set[Tuple[int, int]], int]:
+    def beam_search(self, beam_width: int = 5, adaptive: bool = True) -> Tuple[List[Tuple[int, int]], np.ndarray, int]:
         """
         Perform B* (Beam) Search algorithm.
         
@@ -150,34 +409,37 @@ class PathFinder:
         Returns:
             Tuple containing:
             - List[Tuple[int, int]]: The found path (empty if no path exists)
-            - Set[Tuple[int, int]]: Set of explored nodes
+            - np.ndarray: int32 packed indices (y * width + x) of explored nodes
             - int: Number of nodes expanded
         """
-        start = self.grid.start
-        goal = self.grid.goal
+        start = self.grid.start_id
+        goal = self.grid.goal_id
         
         # Initialize with a larger beam for dense obstacle grids
         if adaptive:
-            obstacle_count = sum(sum(row) for row in self.grid.grid)
-            grid_size = self.grid.width * self.grid.height
-            obstacle_density = obstacle_count / grid_size
+            obstacle_density = self.grid.obstacle_density
             
             # Adaptively adjust beam width based on obstacle density
             if obstacle_density > 0.4:
                 beam_width = max(beam_width * 2, 10)
             elif obstacle_density > 0.3:
-                beam_width = max(beam_width * 1.5, 8)
+                beam_width = max(int(beam_width * 1.5), 8)
 
-        frontier = [(self.grid.manhattan_distance(start, goal), 0, start)]  # Added step count
-        came_from = {}
-        explored = set()
+        heuristic = self.grid.goal_heuristic
+        frontier = [(heuristic.item(start), 0, start)]  # Added step count
+        came_from, closed, explored = self._search_state()
         nodes_expanded = 0
         best_distance = float('inf')
         best_node = None
         steps_without_improvement = 0
+        neighbor_ids, h_costs, _ = self._search_buffers()
+        indptr, indices = self.grid.csr_indptr, self.grid.csr_indices
 
         while frontier:
             next_frontier = []
+            # Tie-breaking noise for every neighbor this level can generate,
+            # drawn in one call rather than one call per neighbor
+            jitter = iter(np.random.uniform(0, 0.1, beam_width * len(NEIGHBOR_OFFSETS)).tolist())
             
             # Process current frontier
             for _ in range(min(beam_width, len(frontier))):
@@ -187,13 +449,15 @@ class PathFinder:
                 _, steps, current = heapq.heappop(frontier)
                 
                 if current == goal:
-                    return self._reconstruct_path(came_from, goal), explored, nodes_expanded
+                    return self._reconstruct_path(came_from, goal), self._explored_array(explored), nodes_expanded
                 
-                explored.add(current)
+                if not closed[current]:
+                    closed[current] = 1
+                    explored.append(current)
                 nodes_expanded += 1
 
                 # Check if this is the closest we've gotten to the goal
-                current_distance = self.grid.manhattan_distance(current, goal)
+                current_distance = heuristic.item(current)
                 if current_distance < best_distance:
                     best_distance = current_distance
                     best_node = current
@@ -202,11 +466,11 @@ class PathFinder:
                     steps_without_improvement += 1
 
                 # Expand neighbors
-                for next_pos in self.grid.get_neighbors(current):
-                    if next_pos not in explored:
-                        priority = self.grid.manhattan_distance(next_pos, goal)
+                count = expand_node(indptr, indices, current, heuristic, neighbor_ids, h_costs)
+                for next_pos, h in zip(neighbor_ids[:count].tolist(), h_costs[:count].tolist()):
+                    if not closed[next_pos]:
                         # Add some randomness to break ties and increase exploration
-                        priority += np.random.uniform(0, 0.1)
+                        priority = h + next(jitter)
                         next_frontier.append((priority, steps + 1, next_pos))
                         came_from[next_pos] = current
             
@@ -224,7 +488,7 @@ class PathFinder:
                 break
         
         # If no path to goal, try to return the path to the closest point reached
-        if best_node and best_node != start:
-            return self._reconstruct_path(came_from, best_node), explored, nodes_expanded
+        if best_node is not None and best_node != start:
+            return self._reconstruct_path(came_from, best_node), self._explored_array(explored), nodes_expanded
         
-        return [], explored, nodes_expanded 
\ No newline at end of file
+        return [], self._explored_array(explored), nodes_expanded 
\ No newline at end of file
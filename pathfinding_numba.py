@@ -0,0 +1,468 @@
+"""
+Compiled Search Loops
+
+This module implements the main loops of A* Search and bidirectional A*
+Search as Numba-compiled functions. Instead of tuples, dicts and heapq they
+work on flat arrays indexed by packed cell index (y * width + x): an
+array-backed binary heap for the frontier and int32 arrays for predecessors
+and g-scores. They read neighbors from the grid's CSR neighbor table and
+heuristic costs from the grid's precomputed heuristic arrays.
+
+The compiled loops follow their PathFinder counterparts step for step,
+including the (f_score, packed index) tie-breaking, so both return the same
+path and expansion count. PathFinder only dispatches here when Numba is
+installed or build_kernels.py has compiled the loops ahead of time (see
+HAVE_COMPILED_SEARCH); interpreted, they would be slower than the heapq
+versions.
+
+Functions:
+    astar_core: A* Search over packed indices
+    astar_bidirectional_core: Bidirectional A* Search over packed indices
+    astar_bidirectional_parallel: Bidirectional A* Search with one thread per side (experimental)
+"""
+
+import threading
+import numpy as np
+from grid_kernels import HAVE_NUMBA, njit
+
+# g-score of nodes the search has not reached yet
+UNREACHED = np.iinfo(np.int32).max
+
+# Expansions per _run_batch call in astar_bidirectional_parallel
+PARALLEL_BATCH = 256
+
+
+@njit(nogil=True, cache=True)
+def _heap_less(heap_f, heap_id, a, b):
+    """Whether heap entry a orders before entry b by (f_score, packed index)."""
+    return heap_f[a] < heap_f[b] or (heap_f[a] == heap_f[b] and heap_id[a] < heap_id[b])
+
+
+@njit(nogil=True, cache=True)
+def _heap_swap(heap_f, heap_id, a, b):
+    """Swap heap entries a and b."""
+    heap_f[a], heap_f[b] = heap_f[b], heap_f[a]
+    heap_id[a], heap_id[b] = heap_id[b], heap_id[a]
+
+
+@njit(nogil=True, cache=True)
+def _heap_push(heap_f, heap_id, size, f, node):
+    """
+    Push (f, node) onto the heap, growing its arrays when full.
+
+    Returns:
+        Tuple containing the (possibly reallocated) heap_f and heap_id arrays
+        and the new heap size
+    """
+    if size == len(heap_f):
+        grown_f = np.empty(2 * size, dtype=heap_f.dtype)
+        grown_id = np.empty(2 * size, dtype=heap_id.dtype)
+        grown_f[:size] = heap_f
+        grown_id[:size] = heap_id
+        heap_f, heap_id = grown_f, grown_id
+    heap_f[size] = f
+    heap_id[size] = node
+    # Sift up
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if not _heap_less(heap_f, heap_id, i, parent):
+            break
+        _heap_swap(heap_f, heap_id, i, parent)
+        i = parent
+    return heap_f, heap_id, size + 1
+
+
+@njit(nogil=True, cache=True)
+def _heap_pop(heap_f, heap_id, size):
+    """
+    Remove the smallest entry from a non-empty heap.
+
+    Returns:
+        Tuple containing the popped f_score and packed index and the new
+        heap size
+    """
+    f = heap_f[0]
+    node = heap_id[0]
+    size -= 1
+    heap_f[0] = heap_f[size]
+    heap_id[0] = heap_id[size]
+    # Sift down
+    i = 0
+    while True:
+        left = 2 * i + 1
+        if left >= size:
+            break
+        child = left
+        if left + 1 < size and _heap_less(heap_f, heap_id, left + 1, left):
+            child = left + 1
+        if not _heap_less(heap_f, heap_id, child, i):
+            break
+        _heap_swap(heap_f, heap_id, i, child)
+        i = child
+    return f, node, size
+
+
+@njit(nogil=True, cache=True)
+def _trace_path(came_from, node):
+    """
+    Follow predecessors back from node to the search start.
+
+    Returns:
+        np.ndarray: int32 packed indices from the start to node
+    """
+    length = 1
+    current = node
+    while came_from[current] != -1:
+        current = came_from[current]
+        length += 1
+    path = np.empty(length, dtype=np.int32)
+    current = node
+    for i in range(length - 1, -1, -1):
+        path[i] = current
+        current = came_from[current]
+    return path
+
+
+@njit(nogil=True, cache=True)
+def astar_core(indptr, indices, heuristic, start, goal):
+    """
+    Perform A* Search on packed indices.
+
+    Args:
+        indptr (np.ndarray): CSR offsets of the grid's neighbor table
+        indices (np.ndarray): CSR neighbor indices of the grid's neighbor table
+        heuristic (np.ndarray): int32 heuristic cost of every packed index
+        start (int): Packed index of the start
+        goal (int): Packed index of the goal
+
+    Returns:
+        Tuple containing:
+        - np.ndarray: int32 packed indices of the path (empty if no path exists)
+        - np.ndarray: int32 packed indices of explored nodes, in expansion order
+        - int: Number of nodes expanded
+    """
+    n_cells = len(indptr) - 1
+
+    came_from = np.full(n_cells, -1, dtype=np.int32)
+    g_score = np.full(n_cells, UNREACHED, dtype=np.int32)
+    closed = np.zeros(n_cells, dtype=np.uint8)
+    explored = np.empty(n_cells, dtype=np.int32)
+    n_explored = 0
+    nodes_expanded = 0
+
+    heap_f = np.empty(64, dtype=np.int64)
+    heap_id = np.empty(64, dtype=np.int32)
+    heap_f, heap_id, size = _heap_push(heap_f, heap_id, 0, 0, start)
+    g_score[start] = 0
+
+    while size > 0:
+        f, current, size = _heap_pop(heap_f, heap_id, size)
+        # Skip entries left behind when the node was pushed again with a
+        # lower g_score
+        if f > g_score[current] + heuristic[current]:
+            continue
+
+        if current == goal:
+            return _trace_path(came_from, goal), explored[:n_explored].copy(), nodes_expanded
+
+        closed[current] = 1
+        explored[n_explored] = current
+        n_explored += 1
+        nodes_expanded += 1
+
+        new_cost = g_score[current] + 1
+        for k in range(indptr[current], indptr[current + 1]):
+            next_pos = indices[k]
+            # Expanded nodes are never reopened, as in PathFinder.astar_search
+            if closed[next_pos]:
+                continue
+            if new_cost < g_score[next_pos]:
+                g_score[next_pos] = new_cost
+                # f_score = g_score + heuristic
+                priority = new_cost + heuristic[next_pos]
+                heap_f, heap_id, size = _heap_push(heap_f, heap_id, size, priority, next_pos)
+                came_from[next_pos] = current
+        # Stop as soon as the goal is reached, as in PathFinder.astar_search
+        if came_from[goal] == current:
+            return _trace_path(came_from, goal), explored[:n_explored].copy(), nodes_expanded
+
+    return np.empty(0, dtype=np.int32), explored[:n_explored].copy(), nodes_expanded
+
+
+@njit(nogil=True, cache=True)
+def _expand_side(indptr, indices, heuristic, heap_f, heap_id, size, g_score, came_from,
+                 g_other, closed, seen, explored, n_explored, best_cost, meet):
+    """
+    Expand the best frontier node of one side of a bidirectional search.
+
+    Every node this side reaches that the other side has reached too closes
+    a start-goal path through it; the cheapest such path is kept in
+    best_cost and meet. A popped entry whose g_score is out of date is
+    dropped without expanding anything. As in astar_core, nodes this side
+    has expanded are never reopened; closed holds this side's flags, while
+    seen marks the nodes already written to explored by either side.
+
+    Returns:
+        Tuple containing the (possibly reallocated) heap_f and heap_id arrays,
+        the new heap size, whether a node was expanded, the new explored
+        count, best_cost and meet
+    """
+    f, current, size = _heap_pop(heap_f, heap_id, size)
+    if f > g_score[current] + heuristic[current]:
+        return heap_f, heap_id, size, False, n_explored, best_cost, meet
+    closed[current] = 1
+    if not seen[current]:
+        seen[current] = 1
+        explored[n_explored] = current
+        n_explored += 1
+    if g_other[current] != UNREACHED and g_score[current] + g_other[current] < best_cost:
+        best_cost = g_score[current] + g_other[current]
+        meet = current
+
+    new_cost = g_score[current] + 1
+    for k in range(indptr[current], indptr[current + 1]):
+        next_pos = indices[k]
+        if closed[next_pos]:
+            continue
+        if new_cost < g_score[next_pos]:
+            g_score[next_pos] = new_cost
+            priority = new_cost + heuristic[next_pos]
+            heap_f, heap_id, size = _heap_push(heap_f, heap_id, size, priority, next_pos)
+            came_from[next_pos] = current
+            if g_other[next_pos] != UNREACHED and new_cost + g_other[next_pos] < best_cost:
+                best_cost = new_cost + g_other[next_pos]
+                meet = next_pos
+    return heap_f, heap_id, size, True, n_explored, best_cost, meet
+
+
+@njit(nogil=True, cache=True)
+def astar_bidirectional_core(indptr, indices, goal_heuristic, start_heuristic, start, goal):
+    """
+    Perform bidirectional A* Search on packed indices.
+
+    Follows PathFinder.astar_bidirectional step for step.
+
+    Args:
+        indptr (np.ndarray): CSR offsets of the grid's neighbor table
+        indices (np.ndarray): CSR neighbor indices of the grid's neighbor table
+        goal_heuristic (np.ndarray): int32 heuristic cost to the goal of every packed index
+        start_heuristic (np.ndarray): int32 heuristic cost to the start of every packed index
+        start (int): Packed index of the start
+        goal (int): Packed index of the goal
+
+    Returns:
+        Tuple containing:
+        - np.ndarray: int32 packed indices of the path (empty if no path exists)
+        - np.ndarray: int32 packed indices of explored nodes, in expansion order
+        - int: Number of nodes expanded
+    """
+    n_cells = len(indptr) - 1
+    g_forward = np.full(n_cells, UNREACHED, dtype=np.int32)
+    g_backward = np.full(n_cells, UNREACHED, dtype=np.int32)
+    came_from_forward = np.full(n_cells, -1, dtype=np.int32)
+    came_from_backward = np.full(n_cells, -1, dtype=np.int32)
+    closed_forward = np.zeros(n_cells, dtype=np.uint8)
+    closed_backward = np.zeros(n_cells, dtype=np.uint8)
+    seen = np.zeros(n_cells, dtype=np.uint8)
+    explored = np.empty(n_cells, dtype=np.int32)
+    n_explored = 0
+    nodes_expanded = 0
+
+    heap_f_forward = np.empty(64, dtype=np.int64)
+    heap_id_forward = np.empty(64, dtype=np.int32)
+    heap_f_backward = np.empty(64, dtype=np.int64)
+    heap_id_backward = np.empty(64, dtype=np.int32)
+    heap_f_forward, heap_id_forward, size_forward = _heap_push(heap_f_forward, heap_id_forward, 0, 0, start)
+    heap_f_backward, heap_id_backward, size_backward = _heap_push(heap_f_backward, heap_id_backward, 0, 0, goal)
+    g_forward[start] = 0
+    g_backward[goal] = 0
+
+    best_cost = UNREACHED
+    meet = -1
+    forward = True
+    while size_forward > 0 and size_backward > 0:
+        # No path through either frontier can beat the best meeting found
+        if max(heap_f_forward[0], heap_f_backward[0]) >= best_cost:
+            break
+        if forward:
+            heap_f_forward, heap_id_forward, size_forward, expanded, n_explored, best_cost, meet = _expand_side(
+                indptr, indices, goal_heuristic, heap_f_forward, heap_id_forward, size_forward,
+                g_forward, came_from_forward, g_backward, closed_forward, seen, explored, n_explored,
+                best_cost, meet)
+        else:
+            heap_f_backward, heap_id_backward, size_backward, expanded, n_explored, best_cost, meet = _expand_side(
+                indptr, indices, start_heuristic, heap_f_backward, heap_id_backward, size_backward,
+                g_backward, came_from_backward, g_forward, closed_backward, seen, explored, n_explored,
+                best_cost, meet)
+        if expanded:
+            nodes_expanded += 1
+            forward = not forward
+
+    if meet == -1:
+        return np.empty(0, dtype=np.int32), explored[:n_explored].copy(), nodes_expanded
+    # start -> meet, then meet -> goal along the backward predecessors
+    head = _trace_path(came_from_forward, meet)
+    tail = _trace_path(came_from_backward, meet)[::-1]
+    return np.concatenate((head, tail[1:])), explored[:n_explored].copy(), nodes_expanded
+
+
+@njit(nogil=True, cache=True)
+def _run_batch(indptr, indices, heuristic, heap_f, heap_id, size, g_score, came_from, g_other,
+               closed, seen, explored, n_explored, best_cost, meet, bound, max_expansions):
+    """
+    Expand up to max_expansions nodes of one side of a parallel bidirectional search.
+
+    The side stops early once the lowest f_score on its frontier is no
+    better than the cheaper of its own best meeting and bound, the other
+    side's best meeting when the batch started; this is the stopping test
+    of astar_bidirectional_core split between the two sides. bound is a
+    plain argument, so nothing written by the other thread is relied on to
+    end the loop.
+
+    Returns:
+        Tuple containing the (possibly reallocated) heap_f and heap_id arrays,
+        the new heap size, the new explored count, best_cost, meet, the
+        number of nodes expanded and whether this side has finished
+    """
+    nodes_expanded = 0
+    while size > 0 and nodes_expanded < max_expansions:
+        if heap_f[0] >= min(best_cost, bound):
+            break
+        heap_f, heap_id, size, expanded, n_explored, best_cost, meet = _expand_side(
+            indptr, indices, heuristic, heap_f, heap_id, size,
+            g_score, came_from, g_other, closed, seen, explored, n_explored, best_cost, meet)
+        if expanded:
+            nodes_expanded += 1
+    finished = size == 0 or heap_f[0] >= min(best_cost, bound)
+    return heap_f, heap_id, size, n_explored, best_cost, meet, nodes_expanded, finished
+
+
+def _run_side(indptr, indices, heuristic, root, g_score, came_from, g_other, closed, seen, explored,
+              side, shared, stats):
+    """
+    Run one side of a parallel bidirectional search until either side stops.
+
+    The side runs in batches of PARALLEL_BATCH expansions, each a _run_batch
+    call that releases the GIL. Between batches, holding the GIL, it
+    publishes its cheapest meeting in shared['best_costs'][side] and
+    shared['meets'][side], reads the other side's as the next batch's
+    bound, and stops once shared['done'] is set or it has finished, setting
+    shared['done'] itself in that case. During a batch the sides share only
+    their g-score arrays: reading a stale entry of g_other can at worst
+    miss a meeting the other side reports later itself.
+
+    Args:
+        indptr (np.ndarray): CSR offsets of the grid's neighbor table
+        indices (np.ndarray): CSR neighbor indices of the grid's neighbor table
+        heuristic (np.ndarray): int32 heuristic cost to the other side's root
+        root (int): Packed index this side searches from
+        g_score (np.ndarray): This side's g-scores, with g_score[root] = 0
+        came_from (np.ndarray): This side's predecessors
+        g_other (np.ndarray): The other side's g-scores, read while it writes them
+        closed (np.ndarray): This side's closed flags
+        seen (np.ndarray): Flags of the nodes this side has written to explored
+        explored (np.ndarray): Buffer receiving this side's explored nodes
+        side (int): 0 for the forward and 1 for the backward search
+        shared (dict): 'best_costs' and 'meets' lists with one slot per
+            side, and the 'done' stop flag
+        stats (np.ndarray): (2, 2) array receiving this side's explored and
+            expanded counts in row side
+    """
+    heap_f = np.empty(64, dtype=np.int64)
+    heap_id = np.empty(64, dtype=np.int32)
+    heap_f, heap_id, size = _heap_push(heap_f, heap_id, 0, 0, root)
+    n_explored = 0
+    nodes_expanded = 0
+    best_cost = UNREACHED
+    meet = -1
+
+    while not shared['done']:
+        heap_f, heap_id, size, n_explored, best_cost, meet, expanded, finished = _run_batch(
+            indptr, indices, heuristic, heap_f, heap_id, size, g_score, came_from, g_other,
+            closed, seen, explored, n_explored, best_cost, meet,
+            shared['best_costs'][1 - side], PARALLEL_BATCH)
+        nodes_expanded += expanded
+        shared['best_costs'][side] = best_cost
+        shared['meets'][side] = meet
+        if finished:
+            shared['done'] = True
+
+    stats[side, 0] = n_explored
+    stats[side, 1] = nodes_expanded
+
+
+def astar_bidirectional_parallel(indptr, indices, goal_heuristic, start_heuristic, start, goal):
+    """
+    Perform bidirectional A* Search with the two sides in parallel threads.
+
+    Experimental and opt-in only. Each side runs _run_side, whose batches
+    release the GIL, so both searches proceed on separate cores. Which
+    side reaches a meeting node first depends on thread timing, so unlike
+    astar_bidirectional_core the expansion count, and among equally cheap
+    paths the path returned, can vary between runs.
+
+    Args:
+        indptr (np.ndarray): CSR offsets of the grid's neighbor table
+        indices (np.ndarray): CSR neighbor indices of the grid's neighbor table
+        goal_heuristic (np.ndarray): int32 heuristic cost to the goal of every packed index
+        start_heuristic (np.ndarray): int32 heuristic cost to the start of every packed index
+        start (int): Packed index of the start
+        goal (int): Packed index of the goal
+
+    Returns:
+        Tuple containing:
+        - np.ndarray: int32 packed indices of the path (empty if no path exists)
+        - np.ndarray: int32 packed indices of explored nodes, forward side first
+        - int: Number of nodes expanded
+    """
+    n_cells = len(indptr) - 1
+    g_score = np.full((2, n_cells), UNREACHED, dtype=np.int32)
+    came_from = np.full((2, n_cells), -1, dtype=np.int32)
+    closed = np.zeros((2, n_cells), dtype=np.uint8)
+    seen = np.zeros((2, n_cells), dtype=np.uint8)
+    explored = np.empty((2, n_cells), dtype=np.int32)
+    shared = {'best_costs': [UNREACHED, UNREACHED], 'meets': [-1, -1], 'done': False}
+    stats = np.zeros((2, 2), dtype=np.int64)
+    g_score[0, start] = 0
+    g_score[1, goal] = 0
+
+    workers = [
+        threading.Thread(target=_run_side, args=(
+            indptr, indices, heuristic, root, g_score[side], came_from[side], g_score[1 - side],
+            closed[side], seen[side], explored[side], side, shared, stats))
+        for side, (heuristic, root) in enumerate(((goal_heuristic, start), (start_heuristic, goal)))
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # Nodes expanded by both sides are reported once
+    forward = explored[0, :stats[0, 0]]
+    backward = explored[1, :stats[1, 0]]
+    explored_nodes = np.concatenate((forward, backward[closed[0, backward] == 0]))
+    nodes_expanded = int(stats[0, 1] + stats[1, 1])
+
+    side = int(np.argmin(shared['best_costs']))
+    meet = shared['meets'][side]
+    if meet == -1:
+        return np.empty(0, dtype=np.int32), explored_nodes, nodes_expanded
+    # start -> meet, then meet -> goal along the backward predecessors
+    head = _trace_path(came_from[0], meet)
+    tail = _trace_path(came_from[1], meet)[::-1]
+    return np.concatenate((head, tail[1:])), explored_nodes, nodes_expanded
+
+# Prefer the ahead-of-time compiled search loops from build_kernels.py, as
+# grid_kernels does for its kernels. The parallel search needs Numba itself
+try:
+    import grid_kernels_aot
+except ImportError:
+    grid_kernels_aot = None
+
+if grid_kernels_aot is not None:
+    astar_core = grid_kernels_aot.astar_core
+    astar_bidirectional_core = grid_kernels_aot.astar_bidirectional_core
+
+# Whether astar_core and astar_bidirectional_core run as machine code
+HAVE_COMPILED_SEARCH = HAVE_NUMBA or grid_kernels_aot is not None
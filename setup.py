@@ -0,0 +1,18 @@
+"""
+Build Script for the Cython A* Loops
+
+This script compiles _astar.pyx into the _astar extension module, placed next
+to this file. PathFinder uses it for A* Search and bidirectional A* Search on
+installs without Numba.
+
+Usage:
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+setup(
+    name='pathfinding-visualization',
+    ext_modules=cythonize([Extension('_astar', ['_astar.pyx'])]),
+)